@@ -1,2 +1,6 @@
 MONTY_CLOUD_IMAGES_BUCKET_NAME = 'montycloud-images'
-DYNAMO_IMAGE_TABLE_NAME = 'montycloud-images'
\ No newline at end of file
+DYNAMO_IMAGE_TABLE_NAME = 'montycloud-images'
+# Images at or below this size are stored inline in their DynamoDB row and
+# served without touching S3. Bounded well under DynamoDB's 400KB item limit
+# to leave room for the metadata attributes.
+INLINE_STORAGE_MAX_BYTES = 256 * 1024
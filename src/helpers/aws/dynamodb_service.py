@@ -1,34 +1,86 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
 import boto3
-from typing import Dict, Any, Optional
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from src.models.image_metadata import ImageMetadata
 
+logger = logging.getLogger(__name__)
+
+# Keep TCP connections alive between calls and leave pool headroom for
+# concurrent requests; default botocore settings re-handshake too often
+_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
+
+# Attributes returned by the list/search paths: every ImageMetadata field,
+# but not inline file bytes or the *_lc search shadow attributes, so
+# projected rows do not ship payloads or duplicated lowercase strings over
+# the wire. 'storage' is a DynamoDB reserved word, hence the #storage alias.
+_LIST_PROJECTION = ('image_id,user_id,filename,content_type,file_size,'
+                    'upload_timestamp,s3_bucket,s3_key,description,#storage')
+_PROJECTION_NAMES = {'#storage': 'storage'}
+
+
+# Hoisted expression strings and key builder so per-request calls do not
+# rebuild identical literals
+_SAVE_CONDITION = 'attribute_not_exists(image_id)'  # Prevent overwrites
+_DELETE_CONDITION = 'attribute_exists(image_id)'  # Ensure item exists
+
+# Bound on UnprocessedKeys retries per batch chunk; with the exponential
+# backoff below this is ~5s of waiting before giving up on a throttled table
+_MAX_BATCH_RETRIES = 8
+
+
+def _image_key(image_id: str) -> Dict[str, Any]:
+    """Primary-key dict for an image row"""
+    return {'image_id': {'S': image_id}}
+
+
+@lru_cache(maxsize=1)
+def _get_dynamodb_client():
+    """Build the DynamoDB client once per container and reuse it across invocations"""
+    return boto3.client('dynamodb', config=_CLIENT_CONFIG)
+
 
 class DynamoDBService:
-    def __init__(self, table_name):
-        self.dynamodb_client = boto3.client('dynamodb')
+    def __init__(self, table_name, dynamodb_client=None):
+        self.dynamodb_client = dynamodb_client or _get_dynamodb_client()
         self.table_name = table_name
 
         if not self.table_name:
             raise ValueError("Table name is not mentioned")
 
-    def save_image_metadata(self, metadata: ImageMetadata) -> Dict[str, Any]:
+    def save_image_metadata(self, metadata: ImageMetadata,
+                            file_bytes: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Save image metadata to DynamoDB
         
         Args:
             metadata: ImageMetadata object
-        
+            file_bytes: Raw file bytes to store inline in the row (only for
+                metadata with storage='inline'; must fit the 400KB item limit)
+
         Returns:
             Dict with save result
         """
         try:
             item = metadata.to_dynamodb_item()
+            if file_bytes is not None:
+                item['file_data'] = {'B': bytes(file_bytes)}
 
             response = self.dynamodb_client.put_item(
                 TableName=self.table_name,
                 Item=item,
-                ConditionExpression='attribute_not_exists(image_id)'  # Prevent overwrites
+                ConditionExpression=_SAVE_CONDITION
             )
 
             return {
@@ -55,7 +107,7 @@ class DynamoDBService:
         try:
             response = self.dynamodb_client.get_item(
                 TableName=self.table_name,
-                Key={'image_id': {'S': image_id}}
+                Key=_image_key(image_id)
             )
 
             if 'Item' not in response:
@@ -65,7 +117,78 @@ class DynamoDBService:
 
             return {
                 'success': True,
-                'metadata': metadata.dict()
+                'metadata': metadata.model_dump()
+            }
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            raise Exception(f'DynamoDB get failed due to client error: {error_code}. Details - {str(e)}')
+        except Exception as e:
+            raise Exception(f'DynamoDB get failed. Details - {str(e)}')
+
+    def get_image_location(self, image_id: str) -> Dict[str, str]:
+        """
+        Get only the S3 key and storage mode for an image
+
+        Uses a ProjectionExpression so callers that just need to locate the
+        bytes pay for two small attributes instead of the full item.
+
+        Args:
+            image_id: Image ID
+
+        Returns:
+            Dict with s3_key and storage ('s3' or 'inline')
+        """
+        try:
+            response = self.dynamodb_client.get_item(
+                TableName=self.table_name,
+                Key=_image_key(image_id),
+                ProjectionExpression='s3_key,#storage',
+                ExpressionAttributeNames=_PROJECTION_NAMES
+            )
+
+            if 'Item' not in response:
+                raise Exception('Image not found')
+
+            item = response['Item']
+            return {
+                's3_key': item['s3_key']['S'],
+                'storage': item.get('storage', {}).get('S', 's3')
+            }
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            raise Exception(f'DynamoDB get failed due to client error: {error_code}. Details - {str(e)}')
+        except Exception as e:
+            raise Exception(f'DynamoDB get failed. Details - {str(e)}')
+
+    def get_inline_image(self, image_id: str) -> Dict[str, Any]:
+        """
+        Get an inline-stored image's bytes and metadata in one read
+
+        Args:
+            image_id: Image ID
+
+        Returns:
+            Dict with raw file_data bytes and the metadata dict
+        """
+        try:
+            response = self.dynamodb_client.get_item(
+                TableName=self.table_name,
+                Key=_image_key(image_id)
+            )
+
+            if 'Item' not in response:
+                raise Exception('Image not found')
+
+            item = response['Item']
+            if 'file_data' not in item:
+                raise Exception('Image is not stored inline')
+
+            return {
+                'success': True,
+                'file_data': item['file_data']['B'],
+                'metadata': ImageMetadata.from_dynamodb_item(item).model_dump()
             }
 
         except ClientError as e:
@@ -74,43 +197,138 @@ class DynamoDBService:
         except Exception as e:
             raise Exception(f'DynamoDB get failed. Details - {str(e)}')
 
+    def batch_get_metadata(self, image_ids: List[str]) -> Dict[str, Any]:
+        """
+        Get metadata for multiple images in one round trip per 100 keys
+
+        Collapses individual GetItem calls into BatchGetItem (up to 100 keys
+        per request) and retries UnprocessedKeys with exponential backoff,
+        per the DynamoDB batch contract.
+
+        Args:
+            image_ids: Image IDs to fetch
+
+        Returns:
+            Dict with list of image metadata (IDs not found are absent)
+        """
+        try:
+            images = []
+            for start in range(0, len(image_ids), 100):
+                chunk = image_ids[start:start + 100]
+                request_items = {
+                    self.table_name: {
+                        'Keys': [_image_key(image_id) for image_id in chunk]
+                    }
+                }
+
+                backoff = 0.05
+                retries = 0
+                while request_items:
+                    response = self.dynamodb_client.batch_get_item(RequestItems=request_items)
+
+                    for item in response.get('Responses', {}).get(self.table_name, []):
+                        images.append(ImageMetadata.dynamodb_item_to_dict(item))
+
+                    # Throttled keys come back as UnprocessedKeys; retry them
+                    # with backoff, but give up after _MAX_BATCH_RETRIES so
+                    # sustained throttling cannot spin until the Lambda timeout
+                    request_items = response.get('UnprocessedKeys') or {}
+                    if request_items:
+                        if retries >= _MAX_BATCH_RETRIES:
+                            remaining = sum(
+                                len(table_keys['Keys'])
+                                for table_keys in request_items.values()
+                            )
+                            raise Exception(
+                                f'{remaining} keys still unprocessed after '
+                                f'{_MAX_BATCH_RETRIES} retries'
+                            )
+                        retries += 1
+                        time.sleep(backoff)
+                        backoff = min(backoff * 2, 1.0)
+
+            return {
+                'success': True,
+                'images': images,
+                'count': len(images)
+            }
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            raise Exception(f'DynamoDB batch get failed due to client error: {error_code}. Details - {str(e)}')
+        except Exception as e:
+            raise Exception(f'DynamoDB batch get failed. Details - {str(e)}')
+
     def list_images_by_user(
             self,
             user_id: str,
-            limit: Optional[int] = None
+            limit: Optional[int] = None,
+            filter_expression: Optional[str] = None,
+            expression_attribute_values: Optional[Dict[str, Any]] = None,
+            projection: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         List images for a specific user
-        
+
         Args:
             user_id: User ID to filter by
             limit: Maximum number of items to return
-        
+            filter_expression: Optional DynamoDB FilterExpression applied server-side
+            expression_attribute_values: Extra attribute values used by filter_expression
+            projection: Optional ProjectionExpression limiting returned attributes
+
         Returns:
             Dict with list of images
         """
         try:
+            expression_values = {':user_id': {'S': user_id}}
+            if expression_attribute_values:
+                expression_values.update(expression_attribute_values)
+
             query_params = {
                 'TableName': self.table_name,
                 'IndexName': 'UserIndex',
                 'KeyConditionExpression': 'user_id = :user_id',
-                'ExpressionAttributeValues': {
-                    ':user_id': {'S': user_id}
-                },
+                'ExpressionAttributeValues': expression_values,
                 'ScanIndexForward': False  # Sort by timestamp descending (newest first)
             }
 
-            # Add limit
+            if filter_expression:
+                query_params['FilterExpression'] = filter_expression
+
+            if projection:
+                query_params['ProjectionExpression'] = projection
+                # Only aliased projections need the name map; attaching it to
+                # a projection that never uses #storage is a ValidationException
+                if '#storage' in projection:
+                    query_params['ExpressionAttributeNames'] = _PROJECTION_NAMES
+
+            # Let DynamoDB stop scanning the partition once enough items have
+            # been looked at, instead of always returning a full page
             if limit:
                 query_params['Limit'] = limit
 
-            response = self.dynamodb_client.query(**query_params)
-
-            # Convert items to metadata objects
+            # DynamoDB applies Limit before FilterExpression, so a filtered
+            # page can come back short; follow LastEvaluatedKey until the
+            # caller's limit is satisfied or the partition is exhausted.
+            # Conversion stops at the limit so the discarded tail never pays
+            # for model construction.
             images = []
-            for item in response.get('Items', []):
-                metadata = ImageMetadata.from_dynamodb_item(item)
-                images.append(metadata.dict())
+            while True:
+                response = self.dynamodb_client.query(**query_params)
+
+                for item in response.get('Items', []):
+                    images.append(ImageMetadata.dynamodb_item_to_dict(item))
+                    if limit and len(images) >= limit:
+                        break
+
+                if limit and len(images) >= limit:
+                    break
+
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_params['ExclusiveStartKey'] = last_key
 
             return {
                 'success': True,
@@ -131,11 +349,20 @@ class DynamoDBService:
     ) -> Dict[str, Any]:
         """
         List images filtered by search criteria
-        
+
+        Filename and description filters are pushed down to DynamoDB as a
+        FilterExpression against the lowercase shadow attributes
+        (filename_lc/description_lc), so non-matching items never leave
+        the table.
+
+        Without a user_id, a filename filter is served by the FilenameIndex
+        GSI as an exact (case-insensitive) match rather than a substring
+        match - the indexed lookup costs O(results) instead of a full scan.
+
         Args:
             search_filters: Dict with search criteria (user_id, filename, description)
             limit: Maximum number of items to return
-        
+
         Returns:
             Dict with filtered images
         """
@@ -143,38 +370,56 @@ class DynamoDBService:
             user_id = search_filters.get('user_id')
             filename_search = search_filters.get('filename')
             description_search = search_filters.get('description')
-            
+
+            # Normalize the search terms once; the items already carry
+            # pre-lowercased shadow attributes so nothing is lowercased per row
+            fn_lc = filename_search.lower() if filename_search else None
+            desc_lc = description_search.lower() if description_search else None
+
+            # Build server-side filter on the lowercase shadow attributes
+            filter_parts = []
+            expression_values = {}
+            if fn_lc:
+                filter_parts.append('contains(filename_lc, :fn)')
+                expression_values[':fn'] = {'S': fn_lc}
+            if desc_lc:
+                filter_parts.append('contains(description_lc, :desc)')
+                expression_values[':desc'] = {'S': desc_lc}
+
+            filter_expression = ' AND '.join(filter_parts) if filter_parts else None
+            if not expression_values:
+                expression_values = None
+
             # If user_id is specified, use efficient user query
             if user_id:
-                all_images = self.list_images_by_user(user_id, limit=None)
+                result = self.list_images_by_user(
+                    user_id,
+                    limit=limit,
+                    filter_expression=filter_expression,
+                    expression_attribute_values=expression_values,
+                    projection=_LIST_PROJECTION
+                )
+            elif fn_lc:
+                # No user_id but a filename: query the FilenameIndex GSI
+                # (exact, case-insensitive match) instead of scanning
+                result = self._query_filename_index(
+                    fn_lc,
+                    limit=limit,
+                    description_lc=desc_lc
+                )
             else:
                 # Scan entire table if no user_id (less efficient)
-                all_images = self._scan_all_images()
-
-            # Apply filename and description filters
-            filtered_images = []
-            for image in all_images['images']:
-                matches = True
-                
-                # Check filename filter
-                if filename_search and filename_search.lower() not in image.get('filename', '').lower():
-                    matches = False
-                
-                # Check description filter  
-                if description_search and description_search.lower() not in image.get('description', '').lower():
-                    matches = False
-                
-                if matches:
-                    filtered_images.append(image)
-                    
-                # Apply limit
-                if limit and len(filtered_images) >= limit:
-                    break
+                result = self._scan_all_images(
+                    limit=limit,
+                    filter_expression=filter_expression,
+                    expression_attribute_values=expression_values,
+                    projection=_LIST_PROJECTION
+                )
 
             return {
                 'success': True,
-                'images': filtered_images,
-                'count': len(filtered_images)
+                'images': result['images'],
+                'count': result['count']
             }
 
         except ClientError as e:
@@ -183,6 +428,72 @@ class DynamoDBService:
         except Exception as e:
             raise Exception(f'DynamoDB search failed. Details - {str(e)}')
 
+    def _query_filename_index(
+            self,
+            filename_lc: str,
+            limit: Optional[int] = None,
+            description_lc: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Query the FilenameIndex GSI for an exact (case-insensitive) filename
+
+        Args:
+            filename_lc: Lowercased filename to match exactly
+            limit: Maximum number of items to return
+            description_lc: Optional lowercased description substring filter
+
+        Returns:
+            Dict with matching images
+        """
+        try:
+            expression_values = {':fn': {'S': filename_lc}}
+
+            query_params = {
+                'TableName': self.table_name,
+                'IndexName': 'FilenameIndex',
+                'KeyConditionExpression': 'filename_lc = :fn',
+                'ExpressionAttributeValues': expression_values,
+                'ProjectionExpression': _LIST_PROJECTION,
+                'ExpressionAttributeNames': _PROJECTION_NAMES,
+                'ScanIndexForward': False  # Newest first
+            }
+
+            if description_lc:
+                query_params['FilterExpression'] = 'contains(description_lc, :desc)'
+                expression_values[':desc'] = {'S': description_lc}
+
+            if limit:
+                query_params['Limit'] = limit
+
+            images = []
+            while True:
+                response = self.dynamodb_client.query(**query_params)
+
+                for item in response.get('Items', []):
+                    images.append(ImageMetadata.dynamodb_item_to_dict(item))
+                    if limit and len(images) >= limit:
+                        break
+
+                if limit and len(images) >= limit:
+                    break
+
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_params['ExclusiveStartKey'] = last_key
+
+            return {
+                'success': True,
+                'images': images,
+                'count': len(images)
+            }
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            raise Exception(f'DynamoDB query failed due to client error: {error_code}. Details - {str(e)}')
+        except Exception as e:
+            raise Exception(f'DynamoDB query failed. Details - {str(e)}')
+
     def delete_image_metadata(self, image_id: str) -> Dict[str, Any]:
         """
         Delete image metadata from DynamoDB
@@ -196,8 +507,8 @@ class DynamoDBService:
         try:
             response = self.dynamodb_client.delete_item(
                 TableName=self.table_name,
-                Key={'image_id': {'S': image_id}},
-                ConditionExpression='attribute_exists(image_id)',  # Ensure item exists
+                Key=_image_key(image_id),
+                ConditionExpression=_DELETE_CONDITION,
                 ReturnValues='ALL_OLD'
             )
 
@@ -209,7 +520,7 @@ class DynamoDBService:
 
             return {
                 'success': True,
-                'deleted_metadata': deleted_metadata.dict()
+                'deleted_metadata': deleted_metadata.model_dump()
             }
 
         except ClientError as e:
@@ -220,25 +531,108 @@ class DynamoDBService:
         except Exception as e:
             raise Exception(f'DynamoDB delete failed. Details - {str(e)}')
 
-    def _scan_all_images(self) -> Dict[str, Any]:
+    def _scan_segment(
+            self,
+            scan_params: Dict[str, Any],
+            segment: int,
+            total_segments: int,
+            limit: Optional[int] = None,
+            stop_event: Optional[threading.Event] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Scan one table segment, following LastEvaluatedKey until the segment
+        is exhausted, it has collected `limit` items (enough on its own to
+        satisfy the caller), or another segment signals the overall limit
+        has been met via stop_event
+        """
+        params = dict(scan_params)
+        params['Segment'] = segment
+        params['TotalSegments'] = total_segments
+
+        items = []
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                return items
+
+            response = self.dynamodb_client.scan(**params)
+            items.extend(response.get('Items', []))
+
+            if limit and len(items) >= limit:
+                return items[:limit]
+
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return items
+            params['ExclusiveStartKey'] = last_key
+
+    def _scan_all_images(
+            self,
+            limit: Optional[int] = None,
+            filter_expression: Optional[str] = None,
+            expression_attribute_values: Optional[Dict[str, Any]] = None,
+            projection: Optional[str] = None,
+            total_segments: int = 8
+    ) -> Dict[str, Any]:
         """
         Scan all images in the table (used when no user_id filter)
-        
+
+        Uses DynamoDB parallel scan (Segment/TotalSegments) so the segments
+        paginate concurrently instead of one 1 MB page at a time.
+
+        Args:
+            limit: Maximum number of items to return
+            filter_expression: Optional DynamoDB FilterExpression applied server-side
+            expression_attribute_values: Attribute values used by filter_expression
+            projection: Optional ProjectionExpression limiting returned attributes
+            total_segments: Number of parallel scan segments
+
         Returns:
             Dict with all images
         """
         try:
+            logger.warning(
+                "Falling back to a full table scan; this reads the whole table "
+                "and consumes RCUs proportionally - prefer user_id queries"
+            )
+
             scan_params = {
                 'TableName': self.table_name
             }
 
-            response = self.dynamodb_client.scan(**scan_params)
+            if filter_expression:
+                scan_params['FilterExpression'] = filter_expression
+                scan_params['ExpressionAttributeValues'] = expression_attribute_values
 
-            # Convert items to metadata objects
-            images = []
-            for item in response.get('Items', []):
-                metadata = ImageMetadata.from_dynamodb_item(item)
-                images.append(metadata.dict())
+            if projection:
+                scan_params['ProjectionExpression'] = projection
+                if '#storage' in projection:
+                    scan_params['ExpressionAttributeNames'] = _PROJECTION_NAMES
+
+            # Cap each page at the caller's limit so DynamoDB stops reading
+            # once any single segment could satisfy the request on its own
+            if limit:
+                scan_params['Limit'] = limit
+
+            stop_event = threading.Event()
+            with ThreadPoolExecutor(max_workers=total_segments) as executor:
+                futures = [
+                    executor.submit(self._scan_segment, scan_params, segment,
+                                    total_segments, limit, stop_event)
+                    for segment in range(total_segments)
+                ]
+
+                # Convert items to metadata objects, stopping at the limit;
+                # once it is reached, signal the still-running segments to
+                # stop paginating instead of scanning to exhaustion
+                images = []
+                for future in futures:
+                    for item in future.result():
+                        images.append(ImageMetadata.dynamodb_item_to_dict(item))
+                        if limit and len(images) >= limit:
+                            break
+                    if limit and len(images) >= limit:
+                        stop_event.set()
+                        break
 
             return {
                 'success': True,
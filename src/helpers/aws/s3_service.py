@@ -1,55 +1,108 @@
-import base64
+import io
+
 import boto3
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, Union
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    # SIMD-accelerated base64 decode when the wheel is available
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode
+
+# Keep TCP connections alive between calls and leave pool headroom for
+# concurrent requests; default botocore settings re-handshake too often
+_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={'mode': 'standard', 'max_attempts': 3}
+)
+
+
+# Multipart threshold keeps small images on a single PUT while larger ones
+# upload in concurrent parts, overlapping network transfer across threads
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=5 * 1024 * 1024,
+    use_threads=True
+)
+
+
+@lru_cache(maxsize=1)
+def _get_s3_client():
+    """Build the S3 client once per container and reuse it across invocations"""
+    return boto3.client('s3', config=_CLIENT_CONFIG)
+
 
 class S3Service:
-    def __init__(self, bucket_name):
-        self.s3_client = boto3.client('s3')
+    def __init__(self, bucket_name, s3_client=None):
+        self.s3_client = s3_client or _get_s3_client()
         self.bucket_name = bucket_name
 
         if not self.bucket_name:
             raise ValueError("IMAGES_BUCKET environment variable not set")
 
-    def upload_file(self, file_data: str, s3_key: str, content_type: str,
-                    metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    def upload_file(self, file_data: Union[str, bytes], s3_key: str, content_type: str,
+                    metadata: Optional[Dict[str, str]] = None,
+                    if_none_match: bool = False) -> Dict[str, Any]:
         """
-        Upload base64 encoded file data to S3
-        
+        Upload file data to S3
+
         Args:
-            file_data: Base64 encoded file data
+            file_data: Raw file bytes, or base64 encoded file data (decoded
+                here); callers that already hold the bytes should pass them
+                directly to avoid a second decode
             s3_key: S3 object key
             content_type: File content type
             metadata: Optional metadata to store with the file
-        
+            if_none_match: If True, make the write conditional on the key not
+                existing (S3 IfNoneMatch='*'), replacing a separate
+                file_exists round trip
+
         Returns:
             Dict with upload result
         """
         try:
-            # Decode base64 file data
-            file_bytes = base64.b64decode(file_data)
+            if isinstance(file_data, (bytes, bytearray, memoryview)):
+                file_bytes = file_data
+            else:
+                # Decode base64 file data
+                file_bytes = _b64decode(file_data)
 
             # Prepare upload parameters
-            upload_params = {
-                'Bucket': self.bucket_name,
-                'Key': s3_key,
-                'Body': file_bytes,
-                'ContentType': content_type
-            }
+            extra_args = {'ContentType': content_type}
 
             if metadata:
-                upload_params['Metadata'] = metadata
+                extra_args['Metadata'] = metadata
 
-            # Upload to S3
-            response = self.s3_client.put_object(**upload_params)
+            if if_none_match:
+                # The transfer manager does not accept IfNoneMatch, so
+                # conditional writes go through a plain PutObject
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=file_bytes,
+                    IfNoneMatch='*',
+                    **extra_args
+                )
+            else:
+                # Stream through the transfer manager; bodies above the
+                # multipart threshold upload in concurrent parts instead of
+                # one serialized PUT
+                self.s3_client.upload_fileobj(
+                    io.BytesIO(file_bytes),
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs=extra_args,
+                    Config=_TRANSFER_CONFIG
+                )
 
             return {
                 'success': True,
                 'bucket': self.bucket_name,
-                's3_key': s3_key,
-                'etag': response.get('ETag'),
-                'version_id': response.get('VersionId')
+                's3_key': s3_key
             }
 
         except ClientError as e:
@@ -93,6 +146,40 @@ class S3Service:
         except Exception as e:
             raise Exception(f'S3 get failed. Details - {str(e)}')
 
+    def iter_file(self, s3_key: str, chunk_size: int = 1 << 20) -> Dict[str, Any]:
+        """
+        Stream file from S3 in chunks instead of materializing the whole body
+
+        Args:
+            s3_key: S3 object key
+            chunk_size: Size of each yielded chunk in bytes
+
+        Returns:
+            Dict with a chunk iterator and object metadata
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=s3_key
+            )
+
+            return {
+                'success': True,
+                'chunks': response['Body'].iter_chunks(chunk_size),
+                'content_type': response.get('ContentType'),
+                'metadata': response.get('Metadata', {}),
+                'last_modified': response.get('LastModified'),
+                'content_length': response.get('ContentLength')
+            }
+
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchKey':
+                raise Exception('File not found')
+            raise Exception(f'S3 get failed due to client error: {error_code}. Details - {str(e)}')
+        except Exception as e:
+            raise Exception(f'S3 get failed. Details - {str(e)}')
+
     def delete_file(self, s3_key: str) -> Dict[str, Any]:
         """
         Delete file from S3
@@ -160,7 +247,13 @@ class S3Service:
             raise Exception(f'Presigned URL generation failed. Details - {str(e)}')
 
     def file_exists(self, s3_key: str) -> bool:
-        """Check if file exists in S3"""
+        """
+        Check if file exists in S3
+
+        Costs a full HeadObject round trip. Pre-write existence checks should
+        use upload_file(if_none_match=True) instead, which folds the check
+        into the PutObject itself.
+        """
         try:
             self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
             return True
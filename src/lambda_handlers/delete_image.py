@@ -1,5 +1,7 @@
 import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from src.constants import MONTY_CLOUD_IMAGES_BUCKET_NAME, DYNAMO_IMAGE_TABLE_NAME
 from src.helpers.aws.s3_service import S3Service
@@ -9,6 +11,24 @@ from src.utils.response import create_success_response, create_error_response
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Matching a precompiled pattern beats constructing (and discarding) a UUID
+# object, and malformed IDs no longer raise. Accepts the compact 32-hex form
+# new uploads use and the legacy hyphenated form of existing rows
+_UUID_RE = re.compile(
+    r'\A(?:[0-9a-f]{32}|'
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\Z',
+    re.IGNORECASE
+)
+
+# Shared across warm invocations so the S3 and DynamoDB deletes can run
+# concurrently instead of paying two sequential round trips
+_executor = ThreadPoolExecutor(max_workers=4)
+
+# Services (and their boto3 clients) are created once per container so warm
+# invocations skip client construction
+_s3_service = S3Service(MONTY_CLOUD_IMAGES_BUCKET_NAME)
+_dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
+
 
 def lambda_handler(event, context):
     """
@@ -36,32 +56,34 @@ def lambda_handler(event, context):
                            extra={'image_id': image_id, 'request_id': context.aws_request_id})
             return create_error_response(400, "Invalid image_id format")
 
-        logger.info("Processing delete request", extra={'image_id': image_id, 'request_id': context.aws_request_id})
-
-        # Initialize services
-        s3_service = S3Service(MONTY_CLOUD_IMAGES_BUCKET_NAME)
-        dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
-
         # Get image metadata first to verify it exists and get S3 key
-        logger.info("Retrieving image metadata", extra={'image_id': image_id, 'request_id': context.aws_request_id})
-        metadata_result = dynamodb_service.get_image_metadata(image_id)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Retrieving image metadata", extra={'image_id': image_id, 'request_id': context.aws_request_id})
+        metadata_result = _dynamodb_service.get_image_metadata(image_id)
         metadata = metadata_result['metadata']
         s3_key = metadata['s3_key']
 
-        # Delete from S3 first
-        logger.info("Deleting file from S3", extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
-        s3_service.delete_file(s3_key)
-        logger.info("S3 deletion successful", extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
-
-        # Delete metadata from DynamoDB
-        logger.info("Deleting metadata from DynamoDB",
-                    extra={'image_id': image_id, 'request_id': context.aws_request_id})
-        metadata_delete_result = dynamodb_service.delete_image_metadata(image_id)
-        logger.info("Metadata deletion successful", extra={'image_id': image_id, 'request_id': context.aws_request_id})
+        # Inline-stored images have no S3 object; deleting the row is enough
+        if metadata.get('storage') == 'inline':
+            metadata_delete_result = _dynamodb_service.delete_image_metadata(image_id)
+        else:
+            # Delete the S3 object and the DynamoDB metadata concurrently; both
+            # round trips are independent and the DynamoDB delete is idempotent
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Deleting file from S3 and metadata from DynamoDB",
+                            extra={'s3_key': s3_key, 'image_id': image_id, 'request_id': context.aws_request_id})
+            s3_future = _executor.submit(_s3_service.delete_file, s3_key)
+            metadata_future = _executor.submit(_dynamodb_service.delete_image_metadata, image_id)
+            wait([s3_future, metadata_future])
+
+            # result() re-raises any exception from either delete
+            s3_future.result()
+            metadata_delete_result = metadata_future.result()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("S3 and metadata deletion successful",
+                        extra={'s3_key': s3_key, 'image_id': image_id, 'request_id': context.aws_request_id})
 
         # Return success response
-        logger.info("Delete operation completed successfully",
-                    extra={'image_id': image_id, 'request_id': context.aws_request_id})
         response_data = {
             'image_id': image_id,
             'deleted_metadata': metadata_delete_result['deleted_metadata']
@@ -80,12 +102,4 @@ def lambda_handler(event, context):
 
 def validate_image_id(image_id: str) -> bool:
     """Validate image_id format (UUID)"""
-    if not image_id:
-        return False
-
-    import uuid
-    try:
-        uuid.UUID(image_id)
-        return True
-    except ValueError:
-        return False
+    return bool(image_id) and _UUID_RE.match(image_id) is not None
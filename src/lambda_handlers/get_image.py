@@ -1,5 +1,16 @@
 import base64
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # SIMD-accelerated encode that returns str directly, skipping the
+    # intermediate bytes -> decode('utf-8') copy
+    from pybase64 import b64encode_as_string as _b64encode_as_string
+except ImportError:
+    def _b64encode_as_string(data):
+        return base64.b64encode(data).decode('utf-8')
+
 from src.constants import MONTY_CLOUD_IMAGES_BUCKET_NAME, DYNAMO_IMAGE_TABLE_NAME
 from src.helpers.aws.s3_service import S3Service
 from src.helpers.aws.dynamodb_service import DynamoDBService
@@ -8,6 +19,28 @@ from src.utils.response import create_success_response, create_error_response
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Matching a precompiled pattern beats constructing (and discarding) a UUID
+# object, and malformed IDs no longer raise. Accepts the compact 32-hex form
+# new uploads use and the legacy hyphenated form of existing rows
+_UUID_RE = re.compile(
+    r'\A(?:[0-9a-f]{32}|'
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\Z',
+    re.IGNORECASE
+)
+
+# Services (and their boto3 clients) are created once per container so warm
+# invocations skip client construction
+_dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
+_s3_service = S3Service(MONTY_CLOUD_IMAGES_BUCKET_NAME)
+
+# Shared across warm invocations; lets the inline path overlap the S3
+# download with the full-metadata read
+_executor = ThreadPoolExecutor(max_workers=2)
+
+# Streaming chunk size for inline responses; a multiple of 3 so the base64
+# output of each chunk concatenates into a valid encoding
+_B64_CHUNK_SIZE = 3 * 1024 * 1024
+
 
 def lambda_handler(event, context):
     """
@@ -15,11 +48,16 @@ def lambda_handler(event, context):
     
     Path parameters:
     - image_id (required): The image ID to retrieve
-    
+
     Query parameters:
-    - download (optional): If 'true', returns the image as a download attachment
-    - presigned (optional): If 'true', returns a presigned URL instead of the file data
+    - download (optional): If 'true', redirects (302) to a presigned URL as a download
+    - inline (optional): If 'true', returns the file data base64-encoded in the JSON body
+    - include_metadata (optional): If 'true', includes the full image metadata
+      in the presigned-URL response (costs an extra full-item read)
     - expires (optional): Expiration time for presigned URL in seconds (default 3600)
+
+    By default a presigned URL is returned instead of the file bytes, so the
+    image payload never flows through Lambda/API Gateway.
     """
 
     logger.info("Get image handler started", extra={'request_id': context.aws_request_id})
@@ -41,13 +79,15 @@ def lambda_handler(event, context):
         # Get query parameters
         query_params = event.get('queryStringParameters') or {}
         download_mode = query_params.get('download', '').lower() == 'true'
-        presigned_mode = query_params.get('presigned', '').lower() == 'true'
+        inline_mode = query_params.get('inline', '').lower() == 'true'
+        include_metadata = query_params.get('include_metadata', '').lower() == 'true'
         expires_str = query_params.get('expires', '3600')
 
-        logger.info("Processing get request", extra={
-            'image_id': image_id, 'presigned_mode': presigned_mode,
-            'download_mode': download_mode, 'request_id': context.aws_request_id
-        })
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processing get request", extra={
+                'image_id': image_id, 'inline_mode': inline_mode,
+                'download_mode': download_mode, 'request_id': context.aws_request_id
+            })
 
         try:
             expires = int(expires_str)
@@ -56,99 +96,126 @@ def lambda_handler(event, context):
         except ValueError:
             expires = 3600
 
-        # Initialize services
-        dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
-        s3_service = S3Service(MONTY_CLOUD_IMAGES_BUCKET_NAME)
-
-        # Get image metadata from DynamoDB
-        logger.info("Retrieving image metadata", extra={'image_id': image_id, 'request_id': context.aws_request_id})
-        metadata_result = dynamodb_service.get_image_metadata(image_id)
-        metadata = metadata_result['metadata']
-        s3_key = metadata['s3_key']
-
-        # If presigned URL requested, return that
-        if presigned_mode:
-            logger.info("Generating presigned URL",
-                        extra={'s3_key': s3_key, 'expires': expires, 'request_id': context.aws_request_id})
-            presigned_result = s3_service.generate_presigned_url(
-                s3_key=s3_key,
-                expiration=expires,
-                http_method='GET'
+        # Inline mode: return the file bytes base64-encoded in the JSON body.
+        # This is the only path that moves the payload through Lambda.
+        if inline_mode:
+            # The S3 key cannot be predicted from image_id, so resolve it
+            # first with a cheap projected read, then overlap the (large) S3
+            # download with the full-metadata read instead of serializing them
+            location = _dynamodb_service.get_image_location(image_id)
+            if location['storage'] == 'inline':
+                # Small images live in the DynamoDB row; one read, no S3
+                return _inline_stored_response(image_id, context)
+            s3_key = location['s3_key']
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Retrieving file and metadata concurrently",
+                            extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
+            file_future = _executor.submit(_s3_service.iter_file, s3_key, _B64_CHUNK_SIZE)
+            metadata_future = _executor.submit(_dynamodb_service.get_image_metadata, image_id)
+            file_result = file_future.result()
+            metadata = metadata_future.result()['metadata']
+
+            # Encode the stream chunk by chunk; peak memory is one raw chunk
+            # plus the encoded parts rather than full raw + encoded copies
+            file_data_base64 = ''.join(
+                _b64encode_as_string(chunk) for chunk in file_result['chunks']
             )
 
-            logger.info("Presigned URL generated successfully", extra={'request_id': context.aws_request_id})
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("File retrieved successfully from S3",
+                            extra={'file_size': file_result['content_length'],
+                                   'request_id': context.aws_request_id})
 
             response_data = {
                 'image_id': image_id,
-                'presigned_url': presigned_result['presigned_url'],
-                'expires_in': expires,
+                'file_data': file_data_base64,
+                'filename': metadata['filename'],
+                'content_type': metadata['content_type'],
+                'file_size': metadata['file_size'],
                 'metadata': metadata
             }
 
             return create_success_response(
                 data=response_data,
-                message="Presigned URL generated successfully"
+                message="Image retrieved successfully"
             )
 
-        # Else, Get the actual file from S3
-        logger.info("Retrieving file from S3", extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
-        file_result = s3_service.get_file(s3_key)
-
-        logger.info("File retrieved successfully from S3",
-                    extra={'file_size': len(file_result['file_data']), 'request_id': context.aws_request_id})
+        # Otherwise hand out a presigned URL so S3 serves the bytes directly.
+        # The S3 key embeds user_id and filename, so one DynamoDB read is
+        # unavoidable — but a projected two-attribute read keeps it small
+        location = _dynamodb_service.get_image_location(image_id)
+        if location['storage'] == 'inline':
+            # No S3 object exists to presign; serve the bytes directly
+            return _inline_stored_response(image_id, context)
+        s3_key = location['s3_key']
 
-        # Encode file data as base64
-        file_data_base64 = base64.b64encode(file_result['file_data']).decode('utf-8')
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Generating presigned URL",
+                        extra={'s3_key': s3_key, 'expires': expires, 'request_id': context.aws_request_id})
+        presigned_result = _s3_service.generate_presigned_url(
+            s3_key=s3_key,
+            expiration=expires,
+            http_method='GET'
+        )
 
         if download_mode:
-            # Prepare response headers
-            response_headers = {
-                'Content-Type': file_result['content_type'] or metadata['content_type'],
-                'Content-Length': str(len(file_result['file_data']))
-            }
-
-            # Force download with original filename
-            filename = metadata['filename']
-            response_headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-            # For download mode, return the file directly
+            # Redirect the client straight to S3 for the download
             return {
-                'statusCode': 200,
-                'headers': response_headers,
-                'body': file_data_base64,
-                'isBase64Encoded': True
-            }
-        else:
-            # For API mode, return JSON with file data and metadata
-            response_data = {
-                'image_id': image_id,
-                'file_data': file_data_base64,
-                'filename': metadata['filename'],
-                'content_type': metadata['content_type'],
-                'file_size': metadata['file_size'],
-                'metadata': metadata
+                'statusCode': 302,
+                'headers': {
+                    'Location': presigned_result['presigned_url'],
+                    'Cache-Control': 'no-store'
+                },
+                'body': ''
             }
 
-            logger.info("Get operation completed successfully",
-                        extra={'image_id': image_id, 'download_mode': download_mode,
-                               'request_id': context.aws_request_id})
-            return create_success_response(
-                data=response_data,
-                message="Image retrieved successfully"
-            )
+        response_data = {
+            'image_id': image_id,
+            'presigned_url': presigned_result['presigned_url'],
+            'expires_in': expires
+        }
+
+        # Fetch the full item lazily, only when the client asked for it
+        if include_metadata:
+            metadata_result = _dynamodb_service.get_image_metadata(image_id)
+            response_data['metadata'] = metadata_result['metadata']
+
+        return create_success_response(
+            data=response_data,
+            message="Presigned URL generated successfully"
+        )
 
     except Exception as e:
         logger.error("Unexpected error in get handler", extra={'error': str(e), 'request_id': context.aws_request_id})
         return create_error_response(500, f"Internal server error: {str(e)}")
 
 
+def _inline_stored_response(image_id: str, context):
+    """Serve an inline-stored image straight from its DynamoDB row"""
+    result = _dynamodb_service.get_inline_image(image_id)
+    metadata = result['metadata']
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Inline image retrieved from DynamoDB",
+                    extra={'image_id': image_id, 'file_size': metadata['file_size'],
+                           'request_id': context.aws_request_id})
+
+    response_data = {
+        'image_id': image_id,
+        'file_data': _b64encode_as_string(result['file_data']),
+        'filename': metadata['filename'],
+        'content_type': metadata['content_type'],
+        'file_size': metadata['file_size'],
+        'metadata': metadata
+    }
+
+    return create_success_response(
+        data=response_data,
+        message="Image retrieved successfully"
+    )
+
+
 def validate_image_id(image_id: str) -> bool:
     """Validate image_id format (UUID)"""
-    if not image_id:
-        return False
-
-    import uuid
-    try:
-        uuid.UUID(image_id)
-        return True
-    except ValueError:
-        return False
+    return bool(image_id) and _UUID_RE.match(image_id) is not None
@@ -8,6 +8,10 @@ from src.utils.response import create_success_response, create_error_response
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Service (and its boto3 client) is created once per container so warm
+# invocations skip client construction
+_dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
+
 
 def lambda_handler(event, context):
     """
@@ -16,8 +20,11 @@ def lambda_handler(event, context):
     Query parameters:
     - user_id (optional): Filter by user ID
     - limit (optional): Number of images to return (1-100, default 20)
-    - filename (optional): Search in filename (partial match)
-    - description (optional): Search in description (partial match)
+    - filename (optional): Search in filename. With user_id this is a
+      case-insensitive substring match; without user_id it is an exact
+      case-insensitive match served by the FilenameIndex GSI
+    - description (optional): Search in description (case-insensitive
+      substring match)
     """
 
     logger.info("List images handler started", extra={'request_id': context.aws_request_id})
@@ -37,13 +44,14 @@ def lambda_handler(event, context):
         filename_search = query_params.get('filename')
         description_search = query_params.get('description')
 
-        logger.info("Processing list request", extra={
-            'user_id': user_id,
-            'limit': limit,
-            'filename_search': filename_search,
-            'description_search': description_search,
-            'request_id': context.aws_request_id
-        })
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processing list request", extra={
+                'user_id': user_id,
+                'limit': limit,
+                'filename_search': filename_search,
+                'description_search': description_search,
+                'request_id': context.aws_request_id
+            })
 
         # Prepare search filters
         search_filters = {}
@@ -54,19 +62,15 @@ def lambda_handler(event, context):
         if description_search:
             search_filters['description'] = description_search.strip()
 
-        # Initialize service
-        dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
-
         # Get images based on filters
-        logger.info("Querying images with search filters",
-                    extra={'search_filters': search_filters, 'request_id': context.aws_request_id})
-        result = dynamodb_service.list_images_by_search(
+        result = _dynamodb_service.list_images_by_search(
             search_filters=search_filters,
             limit=limit
         )
 
-        logger.info("Images retrieved successfully",
-                    extra={'count': result['count'], 'request_id': context.aws_request_id})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Images retrieved successfully",
+                        extra={'count': result['count'], 'request_id': context.aws_request_id})
 
         # Prepare response data
         response_data = {
@@ -77,9 +81,6 @@ def lambda_handler(event, context):
             }
         }
 
-        logger.info("List operation completed successfully",
-                    extra={'count': result['count'], 'filters': search_filters, 'request_id': context.aws_request_id})
-
         return create_success_response(
             data=response_data,
             message=f"Retrieved {result['count']} images"
